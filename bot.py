@@ -4,21 +4,13 @@ Main bot implementation for dYdX trading.
 import logging
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 
 from dydx_api import DydxApiClient
 from breakout_strategy import BreakoutStrategy
 from position_manager import PositionManager
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("dydx_bot.log"),
-        logging.StreamHandler()
-    ]
-)
+from log_config import configure_logging
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +68,10 @@ class DydxTradingBot:
         self.running = False
         self.last_update_time = 0
 
+        # Polling backs off while market data stays unchanged
+        self.max_update_interval = update_interval * 4
+        self.current_update_interval = update_interval
+
     def start(self):
         """
         Start the trading bot.
@@ -87,19 +83,25 @@ class DydxTradingBot:
                    f"Position Size=${self.position_size_usd}, Update Interval={self.update_interval}s")
 
         try:
-            # Initial market data update
-            success = self.strategy.update_market_data()
+            # Initial market data update, server time and market info are
+            # independent requests, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                update_future = executor.submit(self.strategy.update_market_data)
+                time_future = executor.submit(self.api_client.get_time)
+                market_future = executor.submit(self.api_client.get_market, self.market_id)
+
+            success = update_future.result()
             if not success:
                 logger.error("Failed to update initial market data. Exiting.")
                 return
 
             # Get server time
-            time_data = self.api_client.get_time()
+            time_data = time_future.result()
             if "iso" in time_data:
                 logger.info(f"Server time: {time_data['iso']}")
 
             # Get market info
-            market_data = self.api_client.get_market(self.market_id)
+            market_data = market_future.result()
             if "oraclePrice" in market_data:
                 logger.info(f"Current {self.market_id} price: {market_data['oraclePrice']}")
 
@@ -107,17 +109,19 @@ class DydxTradingBot:
             logger.info(f"Initial resistance level: {self.strategy.resistance_level:.2f}, "
                        f"Average volume: {self.strategy.average_volume:.4f}")
 
-            self.last_update_time = time.time()
+            self.last_update_time = time.monotonic()
 
             # Main loop
             while self.running:
-                current_time = time.time()
+                current_time = time.monotonic()
 
                 # Update market data at regular intervals
-                if current_time - self.last_update_time >= self.update_interval:
+                if current_time - self.last_update_time >= self.current_update_interval:
                     logger.info("Updating market data...")
+                    previous_state = self._market_state()
                     self.strategy.update_market_data()
                     self.last_update_time = current_time
+                    self._adapt_update_interval(previous_state)
 
                     # Log current state
                     logger.info(f"Current price: {self.strategy.current_price:.2f}, "
@@ -147,7 +151,7 @@ class DydxTradingBot:
 
                         # Update market data after waiting
                         self.strategy.update_market_data()
-                        self.last_update_time = time.time()
+                        self.last_update_time = time.monotonic()
 
                 # If no active position, look for new opportunities
                 else:
@@ -168,6 +172,10 @@ class DydxTradingBot:
                             take_profit=levels["take_profit"]
                         )
 
+                        # Exit checks need fresh prices, so drop any polling backoff now
+                        if position.get("status") == "OPEN":
+                            self.current_update_interval = self.update_interval
+
                         logger.info(f"Opened position: {position}")
                         logger.info(f"Entry: {levels['entry_price']:.2f}, "
                                    f"Stop Loss: {levels['stop_loss']:.2f}, "
@@ -186,6 +194,32 @@ class DydxTradingBot:
             # Clean up
             self.stop()
 
+    def _market_state(self) -> tuple:
+        """
+        Snapshot of the indicators refreshed by a market data update.
+
+        Returns:
+            tuple: (current price, resistance level, average volume)
+        """
+        return (self.strategy.current_price, self.strategy.resistance_level, self.strategy.average_volume)
+
+    def _adapt_update_interval(self, previous_state: tuple):
+        """
+        Double the polling interval after an update that changed nothing.
+
+        The interval is capped at max_update_interval and drops back to the
+        base interval as soon as data changes or while a position is open,
+        since exit checks rely on fresh prices.
+
+        Args:
+            previous_state: Market state before the update
+        """
+        if self.position_manager.active_position or self._market_state() != previous_state:
+            self.current_update_interval = self.update_interval
+        else:
+            self.current_update_interval = min(self.current_update_interval * 2, self.max_update_interval)
+            logger.info(f"Market data unchanged, next update in {self.current_update_interval}s")
+
     def stop(self):
         """
         Stop the trading bot.
@@ -200,6 +234,8 @@ class DydxTradingBot:
                 reason="bot_shutdown"
             )
 
+        self.strategy.stop()
+        self.api_client.close()
         logger.info("Bot shutdown complete.")
 
 def parse_args():
@@ -223,6 +259,9 @@ def parse_args():
     return parser.parse_args()
 
 if __name__ == "__main__":
+    # Configure logging
+    configure_logging("dydx_bot.log")
+
     args = parse_args()
 
     bot = DydxTradingBot(
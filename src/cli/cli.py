@@ -12,23 +12,15 @@ from ..core.auth import create_client, get_account_info
 from ..core.market_data import MarketData
 from ..strategies.strategy import BreakoutStrategy
 from ..core.order_manager import OrderManager
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, config.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(config.LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+from ..utils.log_config import configure_logging
 
 logger = logging.getLogger(__name__)
 
 @click.group()
 def cli():
     """dYdX Trading Bot - Breakout Strategy with Volume Confirmation"""
-    pass
+    # Configure logging only when the CLI actually runs, not on import
+    configure_logging(config.LOG_FILE, level=getattr(logging, config.LOG_LEVEL))
 
 @cli.command()
 @click.option('--market', default=config.DEFAULT_MARKET, help='Market symbol (e.g., "ETH-USD")')
@@ -75,7 +67,8 @@ def start(market, timeframe, volume_factor, resistance_periods, risk_reward, pos
         client=client,
         market=market,
         position_size_usd=position_size,
-        simulation_mode=simulation
+        simulation_mode=simulation,
+        price_source=market_data.get_streamed_price
     )
 
     # Start WebSocket for real-time data
@@ -127,8 +120,8 @@ def start(market, timeframe, volume_factor, resistance_periods, risk_reward, pos
 
                     logger.info(f"Opened position: {position}")
 
-            # Sleep for a short time before next iteration
-            time.sleep(10)
+            # Wait for streamed market data, or at most 10 seconds
+            market_data.wait_for_update(timeout=10)
 
     except KeyboardInterrupt:
         logger.info("Bot stopped by user.")
@@ -143,6 +136,9 @@ def start(market, timeframe, volume_factor, resistance_periods, risk_reward, pos
             logger.info("Closing active position before exit...")
             order_manager.close_position("bot_shutdown")
 
+        # Write out any queued trades/positions
+        order_manager.data_manager.close()
+
         logger.info("Bot shutdown complete.")
 
 @cli.command()
@@ -24,10 +24,21 @@ MNEMONIC = os.getenv("DYDX_MNEMONIC", "")
 # Trading parameters
 DEFAULT_MARKET = "ETH-USD"
 DEFAULT_TIMEFRAME = "5m"  # Options: "1m", "5m", "15m", "1h", "4h", "1d"
+CANDLE_RESOLUTIONS = {  # Indexer candle resolution for each timeframe
+    "1m": "1MIN",
+    "5m": "5MINS",
+    "15m": "15MINS",
+    "30m": "30MINS",
+    "1h": "1HOUR",
+    "4h": "4HOURS",
+    "1d": "1DAY"
+}
 DEFAULT_VOLUME_FACTOR = 2.0  # Volume must be this times the average to confirm breakout
 DEFAULT_RESISTANCE_PERIODS = 24  # Number of periods to look back for resistance
 DEFAULT_RISK_REWARD_RATIO = 3.0  # Take profit at 3x the risk
+STOP_LOSS_FACTOR = 0.99  # Stop loss as a fraction of the broken resistance level
 DEFAULT_POSITION_SIZE_USD = 100  # Position size in USD
+DEFAULT_SIZE_PRECISION = 4  # Decimal places order sizes are rounded to
 
 # Logging
 LOG_LEVEL = "INFO"
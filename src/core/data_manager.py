@@ -1,15 +1,95 @@
 """
 Data persistence manager for the dYdX trading bot.
 """
+import atexit
 import json
 import os
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
-import pandas as pd
+import queue
+import tempfile
+import textwrap
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+try:
+    from orjson import loads as orjson_loads
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    orjson_loads = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, cleanup falls back to a full load
+    ijson = None
+
+from ..utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
+# Background writer: how long to wait for more writes before flushing
+WRITE_FLUSH_INTERVAL = 0.1
+WRITE_BATCH_SIZE = 100
+
+# Records stamped within the same window share one formatted timestamp
+TIMESTAMP_CACHE_NS = 1_000_000
+
+# Mode for newly created data files. os.umask can only be read by setting
+# it, so do that once at import rather than from the writer thread.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+def _json_loads(data: bytes):
+    """
+    Parse JSON, with orjson when available.
+    
+    json.dump writes NaN/Infinity for non-finite floats, which orjson
+    rejects, so such documents are parsed by the stdlib instead.
+    
+    Args:
+        data: Raw JSON document
+        
+    Returns:
+        Parsed JSON value
+    """
+    if orjson_loads is not None:
+        try:
+            return orjson_loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+
+@njit(cache=True)
+def _max_drawdown(pnls):
+    """
+    Compute the maximum peak-to-trough drawdown of a P&L series.
+
+    Args:
+        pnls: Array of per-trade P&L values in chronological order
+
+    Returns:
+        float: Maximum drawdown
+    """
+    running_pnl = 0.0
+    peak = 0.0
+    max_drawdown = 0.0
+
+    for pnl in pnls:
+        running_pnl += pnl
+        if running_pnl > peak:
+            peak = running_pnl
+        drawdown = peak - running_pnl
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+
+    return max_drawdown
+
+
 class DataManager:
     """
     Manages data persistence for trades, positions, and bot state.
@@ -36,30 +116,135 @@ class DataManager:
         self.positions_file = os.path.join(self.data_dir, "positions.json")
         self.bot_state_file = os.path.join(self.data_dir, "bot_state.json")
         self.performance_file = os.path.join(self.data_dir, "performance.json")
+        
+        # In-memory positions and order_id -> list index, loaded on first save
+        self._positions = None
+        self._position_index = None
+        
+        # Queued writes drained by a background thread, started on first enqueue
+        self._io_lock = threading.Lock()
+        self._write_queue = queue.Queue()
+        self._writer_thread = None
+        self._log_writes = True  # Turned off for the flush at interpreter exit
+        
+        # Last formatted timestamp as (time.time_ns(), ISO string)
+        self._timestamp_cache = (0, '')
     
-    def save_trade(self, trade_data: Dict):
+    @contextmanager
+    def _atomic_write(self, path: str):
+        """
+        Open a uniquely named temporary file that replaces path on success.
+        
+        A crash or error mid-write never leaves a truncated file, and
+        concurrent writers never share a temporary file. The replaced file
+        keeps its permissions (new files get the umask default).
+        
+        Args:
+            path: Destination file path
+            
+        Yields:
+            File object to write the new contents to
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                yield f
+            # mkstemp creates owner-only files; keep the target's mode instead
+            try:
+                mode = os.stat(path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = NEW_FILE_MODE
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _write_json(self, path: str, data):
+        """
+        Atomically write data as JSON to a file.
+        
+        Args:
+            path: Destination file path
+            data: JSON-serializable data
+        """
+        with self._atomic_write(path) as f:
+            json.dump(data, f, indent=2, default=str)
+    
+    def _read_json(self, path: str, default):
+        """
+        Read a JSON file, raising if it exists but cannot be parsed.
+        
+        Writers use this instead of the load_* methods so that a file which
+        fails to load is never overwritten as if it were empty.
+        
+        Args:
+            path: File path
+            default: Value returned if the file does not exist
+            
+        Returns:
+            Parsed JSON value, or default
+        """
+        if not os.path.exists(path):
+            return default
+        with open(path, 'rb') as f:
+            return _json_loads(f.read())
+    
+    def _now_iso(self) -> str:
+        """
+        Get the current local time as an ISO string.
+        
+        Bursts of records stamped within TIMESTAMP_CACHE_NS of each other
+        reuse the same string instead of formatting it again.
+        
+        Returns:
+            str: ISO timestamp
+        """
+        now = time.time_ns()
+        cached_at, cached = self._timestamp_cache
+        if now - cached_at < TIMESTAMP_CACHE_NS:
+            return cached
+        
+        cached = datetime.fromtimestamp(now / 1e9).isoformat()
+        self._timestamp_cache = (now, cached)
+        return cached
+    
+    def save_trade(self, trade_data: Dict, timestamp: Optional[str] = None):
         """
         Save a completed trade to the trades file.
         
         Args:
             trade_data: Trade information dictionary
+            timestamp: ISO timestamp to record (defaults to now)
+        """
+        # Add timestamp if not present
+        if 'timestamp' not in trade_data:
+            trade_data['timestamp'] = timestamp or self._now_iso()
+        
+        self._save_trades([trade_data])
+    
+    def _save_trades(self, new_trades: List[Dict]):
+        """
+        Append a batch of trades to the trades file in a single write.
+        
+        Args:
+            new_trades: Trade records to append
         """
         try:
-            # Add timestamp if not present
-            if 'timestamp' not in trade_data:
-                trade_data['timestamp'] = datetime.now().isoformat()
-            
-            # Load existing trades
-            trades = self.load_trades()
-            
-            # Add new trade
-            trades.append(trade_data)
+            with self._io_lock:
+                # Load existing trades; a failed load aborts rather than overwriting history
+                trades = self._read_json(self.trades_file, [])
+                
+                # Add new trades
+                trades.extend(new_trades)
+                
+                # Save back to file
+                self._write_json(self.trades_file, trades)
             
-            # Save back to file
-            with open(self.trades_file, 'w') as f:
-                json.dump(trades, f, indent=2, default=str)
-            
-            logger.info(f"Saved trade: {trade_data.get('market', 'Unknown')} - {trade_data.get('side', 'Unknown')}")
+            if self._log_writes:
+                for trade_data in new_trades:
+                    logger.info(f"Saved trade: {trade_data.get('market', 'Unknown')} - {trade_data.get('side', 'Unknown')}")
             
         except Exception as e:
             logger.error(f"Failed to save trade: {str(e)}")
@@ -72,51 +257,173 @@ class DataManager:
             List[Dict]: List of trade records
         """
         try:
-            if os.path.exists(self.trades_file):
-                with open(self.trades_file, 'r') as f:
-                    return json.load(f)
-            return []
+            return self._read_json(self.trades_file, [])
         except Exception as e:
             logger.error(f"Failed to load trades: {str(e)}")
             return []
     
-    def save_position(self, position_data: Dict):
+    def save_position(self, position_data: Dict, timestamp: Optional[str] = None):
         """
         Save position data.
         
         Args:
             position_data: Position information dictionary
+            timestamp: ISO timestamp to record (defaults to now)
+        """
+        # Add timestamp if not present
+        if 'timestamp' not in position_data:
+            position_data['timestamp'] = timestamp or self._now_iso()
+        
+        self._save_positions([position_data])
+    
+    def _save_positions(self, updates: List[Dict]):
+        """
+        Add or update a batch of positions and write the file once.
+        
+        Args:
+            updates: Position records, applied in order
         """
         try:
-            # Add timestamp if not present
-            if 'timestamp' not in position_data:
-                position_data['timestamp'] = datetime.now().isoformat()
+            with self._io_lock:
+                # Load existing positions
+                if self._positions is None:
+                    self._load_position_index()
+                positions = self._positions
+                
+                for position_data in updates:
+                    # Add or update position
+                    position_id = position_data.get('order_id', f"pos_{len(positions)}")
+                    
+                    # Find existing position or add new one
+                    index = self._position_index.get(position_id)
+                    if index is not None:
+                        positions[index] = position_data
+                    else:
+                        self._position_index.setdefault(position_data.get('order_id'), len(positions))
+                        positions.append(position_data)
+                    
+                    logger.debug("Saved position: %s", position_id)
+                
+                # Save back to file
+                self._write_json(self.positions_file, positions)
             
-            # Load existing positions
-            positions = self.load_positions()
-            
-            # Add or update position
-            position_id = position_data.get('order_id', f"pos_{len(positions)}")
+        except Exception as e:
+            logger.error(f"Failed to save position: {str(e)}")
+    
+    def enqueue_trade(self, trade_data: Dict, timestamp: Optional[str] = None):
+        """
+        Queue a completed trade to be saved by the background writer.
+        
+        Args:
+            trade_data: Trade information dictionary
+            timestamp: ISO timestamp to record (defaults to now)
+        """
+        if 'timestamp' not in trade_data:
+            trade_data['timestamp'] = timestamp or self._now_iso()
+        self._enqueue('trade', trade_data)
+    
+    def enqueue_position(self, position_data: Dict, timestamp: Optional[str] = None):
+        """
+        Queue position data to be saved by the background writer.
+        
+        Args:
+            position_data: Position information dictionary
+            timestamp: ISO timestamp to record (defaults to now)
+        """
+        if 'timestamp' not in position_data:
+            position_data['timestamp'] = timestamp or self._now_iso()
+        self._enqueue('position', position_data)
+    
+    def _enqueue(self, kind: str, data: Dict):
+        """
+        Put a write on the queue, starting the writer thread if needed.
+        
+        Args:
+            kind: 'trade' or 'position'
+            data: Record to save
+        """
+        if self._writer_thread is None:
+            self._writer_thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._writer_thread.start()
+            atexit.register(self._close_at_exit)
+        self._write_queue.put((kind, data))
+    
+    def _flush_loop(self):
+        """
+        Drain queued writes, coalescing bursts into one write per file.
+        """
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                self._write_queue.task_done()
+                return
             
-            # Find existing position or add new one
-            updated = False
-            for i, pos in enumerate(positions):
-                if pos.get('order_id') == position_id:
-                    positions[i] = position_data
-                    updated = True
+            # Give a burst a moment to accumulate before writing
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + WRITE_FLUSH_INTERVAL
+            while len(batch) < WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     break
+                try:
+                    item = self._write_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
             
-            if not updated:
-                positions.append(position_data)
-            
-            # Save back to file
-            with open(self.positions_file, 'w') as f:
-                json.dump(positions, f, indent=2, default=str)
-            
-            logger.debug(f"Saved position: {position_id}")
+            positions = [data for kind, data in batch if kind == 'position']
+            trades = [data for kind, data in batch if kind == 'trade']
+            if positions:
+                self._save_positions(positions)
+            if trades:
+                self._save_trades(trades)
             
-        except Exception as e:
-            logger.error(f"Failed to save position: {str(e)}")
+            for _ in range(len(batch) + stop):
+                self._write_queue.task_done()
+            if stop:
+                return
+    
+    def flush(self):
+        """
+        Block until all queued writes have been written.
+        """
+        if self._writer_thread is not None:
+            self._write_queue.join()
+    
+    def close(self):
+        """
+        Flush queued writes and stop the background writer.
+        """
+        thread = self._writer_thread
+        if thread is None:
+            return
+        self._writer_thread = None
+        atexit.unregister(self._close_at_exit)
+        self._write_queue.put(None)
+        thread.join()
+    
+    def _close_at_exit(self):
+        """
+        Flush queued writes at interpreter exit without logging each one.
+        
+        Log streams (e.g. a test runner's captured stderr) may already be
+        closed by the time atexit handlers run.
+        """
+        self._log_writes = False
+        self.close()
+    
+    def _load_position_index(self):
+        """
+        Load positions from disk and index them by order_id.
+        """
+        self._positions = self._read_json(self.positions_file, [])
+        self._position_index = {}
+        for i, pos in enumerate(self._positions):
+            self._position_index.setdefault(pos.get('order_id'), i)
     
     def load_positions(self) -> List[Dict]:
         """
@@ -126,26 +433,23 @@ class DataManager:
             List[Dict]: List of position records
         """
         try:
-            if os.path.exists(self.positions_file):
-                with open(self.positions_file, 'r') as f:
-                    return json.load(f)
-            return []
+            return self._read_json(self.positions_file, [])
         except Exception as e:
             logger.error(f"Failed to load positions: {str(e)}")
             return []
     
-    def save_bot_state(self, state_data: Dict):
+    def save_bot_state(self, state_data: Dict, timestamp: Optional[str] = None):
         """
         Save bot state information.
         
         Args:
             state_data: Bot state dictionary
+            timestamp: ISO timestamp to record (defaults to now)
         """
         try:
-            state_data['timestamp'] = datetime.now().isoformat()
+            state_data['timestamp'] = timestamp or self._now_iso()
             
-            with open(self.bot_state_file, 'w') as f:
-                json.dump(state_data, f, indent=2, default=str)
+            self._write_json(self.bot_state_file, state_data)
             
             logger.debug("Saved bot state")
             
@@ -160,10 +464,7 @@ class DataManager:
             Optional[Dict]: Bot state or None if not found
         """
         try:
-            if os.path.exists(self.bot_state_file):
-                with open(self.bot_state_file, 'r') as f:
-                    return json.load(f)
-            return None
+            return self._read_json(self.bot_state_file, None)
         except Exception as e:
             logger.error(f"Failed to load bot state: {str(e)}")
             return None
@@ -205,18 +506,9 @@ class DataManager:
         gross_loss = abs(sum(trade.get('pnl', 0) for trade in losses))
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
         
-        # Calculate drawdown
-        running_pnl = 0
-        peak = 0
-        max_drawdown = 0
-        
-        for trade in trades:
-            running_pnl += trade.get('pnl', 0)
-            if running_pnl > peak:
-                peak = running_pnl
-            drawdown = peak - running_pnl
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
+        # Calculate drawdown (JIT-compiled when numba is available)
+        pnls = np.fromiter((trade.get('pnl', 0) for trade in trades), dtype=np.float64, count=total_trades)
+        max_drawdown = float(_max_drawdown(pnls))
         
         metrics = {
             "total_trades": total_trades,
@@ -234,8 +526,7 @@ class DataManager:
         
         # Save performance metrics
         try:
-            with open(self.performance_file, 'w') as f:
-                json.dump(metrics, f, indent=2, default=str)
+            self._write_json(self.performance_file, metrics)
         except Exception as e:
             logger.error(f"Failed to save performance metrics: {str(e)}")
         
@@ -259,6 +550,9 @@ class DataManager:
         try:
             trades = self.load_trades()
             if trades:
+                # pandas is only needed here, so it is not imported with the module
+                import pandas as pd
+                
                 df = pd.DataFrame(trades)
                 df.to_csv(filepath, index=False)
                 logger.info(f"Exported {len(trades)} trades to {filepath}")
@@ -279,20 +573,62 @@ class DataManager:
             days_to_keep: Number of days of data to keep
         """
         try:
-            cutoff_date = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
+            # ISO-8601 timestamps sort lexicographically, so compare strings
+            cutoff_iso = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
             
-            # Clean trades
-            trades = self.load_trades()
-            recent_trades = []
-            for trade in trades:
-                trade_time = datetime.fromisoformat(trade.get('timestamp', '1970-01-01')).timestamp()
-                if trade_time > cutoff_date:
-                    recent_trades.append(trade)
-            
-            if len(recent_trades) != len(trades):
-                with open(self.trades_file, 'w') as f:
-                    json.dump(recent_trades, f, indent=2, default=str)
-                logger.info(f"Cleaned up trades: kept {len(recent_trades)} out of {len(trades)}")
+            # Hold the I/O lock so queued trade writes cannot interleave with the rewrite
+            with self._io_lock:
+                # Clean trades
+                if not os.path.exists(self.trades_file):
+                    return
+                
+                if ijson is not None:
+                    try:
+                        kept, total = self._filter_trades_streaming(cutoff_iso)
+                        if kept != total:
+                            logger.info(f"Cleaned up trades: kept {kept} out of {total}")
+                        return
+                    except ijson.JSONError as e:
+                        # ijson rejects the NaN/Infinity tokens json.dump may write
+                        logger.warning("Streaming cleanup failed (%s), falling back to a full load", e)
+                
+                trades = self._read_json(self.trades_file, [])
+                recent_trades = [trade for trade in trades if trade.get('timestamp', '') > cutoff_iso]
+                
+                if len(recent_trades) != len(trades):
+                    self._write_json(self.trades_file, recent_trades)
+                    logger.info(f"Cleaned up trades: kept {len(recent_trades)} out of {len(trades)}")
             
         except Exception as e:
             logger.error(f"Failed to cleanup old data: {str(e)}")
+    
+    def _filter_trades_streaming(self, cutoff_iso: str) -> Tuple[int, int]:
+        """
+        Drop trades older than the cutoff without loading the whole file.
+        
+        Trades are parsed one at a time with ijson and survivors are written
+        to a temporary file that atomically replaces the trades file. The
+        caller must hold the I/O lock.
+        
+        Args:
+            cutoff_iso: ISO timestamp; older trades are discarded
+            
+        Returns:
+            Tuple[int, int]: (kept, total) trade counts
+        """
+        kept = 0
+        total = 0
+        
+        with self._atomic_write(self.trades_file) as dst:
+            with open(self.trades_file, 'rb') as src:
+                # Reproduce the layout of json.dump(trades, indent=2) used by _write_json
+                dst.write('[')
+                for trade in ijson.items(src, 'item', use_float=True):
+                    total += 1
+                    if trade.get('timestamp', '') > cutoff_iso:
+                        dst.write(',\n' if kept else '\n')
+                        dst.write(textwrap.indent(json.dumps(trade, indent=2, default=str), '  '))
+                        kept += 1
+                dst.write('\n]' if kept else ']')
+        
+        return kept, total
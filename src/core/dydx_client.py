@@ -1,12 +1,18 @@
 """
 dYdX Client wrapper for handling different client versions and providing a unified interface.
 """
+import itertools
 import logging
+import secrets
 from typing import Optional, Dict, Any
 from . import config
 
 logger = logging.getLogger(__name__)
 
+# Simulated order ids: a random per-process prefix plus a counter
+_ORDER_ID_PREFIX = secrets.token_hex(4)
+_ORDER_ID_COUNTER = itertools.count(1)
+
 class DydxClientWrapper:
     """
     Wrapper class for dYdX client that handles different client versions
@@ -186,10 +192,9 @@ class DydxClientWrapper:
         
         if self.simulation_mode:
             # Return mock order response for simulation
-            import uuid
             import time
             
-            order_id = str(uuid.uuid4())
+            order_id = f"{_ORDER_ID_PREFIX}{next(_ORDER_ID_COUNTER):x}"
             
             response = {
                 "order_id": order_id,
@@ -202,7 +207,7 @@ class DydxClientWrapper:
                 "fee": "2.0"  # Mock fee
             }
             
-            logger.info(f"Simulated order placed: {response}")
+            logger.info("Simulated order placed: %s", response)
             return response
         
         # TODO: Implement real order placement
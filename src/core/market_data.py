@@ -3,17 +3,160 @@ Market data collection module for dYdX trading bot.
 """
 import logging
 import time
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
+import numpy as np
 import pandas as pd
 import websocket
 import json
 import threading
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    json_loads = json.loads
+
 from .dydx_client import DydxClientWrapper
 from . import config
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=1024)
+def _epoch_seconds(timestamp: str) -> float:
+    """
+    Convert an indexer ISO-8601 timestamp to Unix epoch seconds.
+
+    Cached because every update of a forming candle repeats its startedAt.
+
+    Args:
+        timestamp: Timestamp such as "2024-01-01T00:00:00.000Z"
+
+    Returns:
+        float: Seconds since the epoch
+    """
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+
+
+class CandleRingBuffer:
+    """
+    Fixed-capacity candle history stored in preallocated NumPy arrays.
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``n`` candles are always a contiguous slice in chronological order.
+    Start timestamps are kept as float epoch seconds.
+    """
+
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+    API_FIELDS = ('open', 'high', 'low', 'close', 'baseTokenVolume')
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity: Maximum number of candles kept
+        """
+        self.capacity = capacity
+        self._values = np.empty((len(self.FIELDS), 2 * capacity), dtype=np.float64)
+        self._timestamps = np.empty(2 * capacity, dtype=np.float64)
+        self._head = 0  # Next slot to write
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        """Drop all candles."""
+        self._head = 0
+        self._count = 0
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        """Start time of the most recent candle in epoch seconds."""
+        if not self._count:
+            return None
+        return self._timestamps[self._head - 1 + self.capacity]
+
+    def push(self, candle: Dict):
+        """
+        Append an indexer candle, evicting the oldest one when full.
+
+        Args:
+            candle: Raw candle with string price/volume fields
+        """
+        self._write(self._head, candle)
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, candles: List[Dict]):
+        """
+        Append a batch of indexer candles in chronological order.
+
+        Each column is parsed in a single pass and copied into the ring
+        with one vectorized assignment instead of a push per candle.
+
+        Args:
+            candles: Raw candles with string price/volume fields, oldest first
+        """
+        candles = candles[-self.capacity:]
+        n = len(candles)
+        if not n:
+            return
+
+        columns = np.empty((len(self.API_FIELDS), n), dtype=np.float64)
+        for i, field in enumerate(self.API_FIELDS):
+            columns[i] = np.fromiter((float(c[field]) for c in candles), dtype=np.float64, count=n)
+
+        # Parse all startedAt strings in one vectorized call, as epoch seconds
+        started_at = pd.to_datetime([c['startedAt'] for c in candles], utc=True, format='ISO8601', cache=True)
+        timestamps = started_at.to_numpy(dtype='datetime64[ns]').view(np.int64) / 1e9
+
+        slots = (self._head + np.arange(n)) % self.capacity
+        self._values[:, slots] = columns
+        self._values[:, slots + self.capacity] = columns
+        self._timestamps[slots] = timestamps
+        self._timestamps[slots + self.capacity] = timestamps
+
+        self._head = (self._head + n) % self.capacity
+        self._count = min(self._count + n, self.capacity)
+
+    def replace_last(self, candle: Dict):
+        """
+        Overwrite the most recent candle (e.g. the one still forming).
+
+        Args:
+            candle: Raw candle with string price/volume fields
+        """
+        self._write((self._head - 1) % self.capacity, candle)
+
+    def window(self, periods: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Get the most recent candles as column arrays, oldest first.
+
+        Args:
+            periods: Number of candles (defaults to all)
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays keyed by column name, plus 'timestamp' in epoch seconds
+        """
+        n = self._count if periods is None else min(periods, self._count)
+        end = self._head + self.capacity
+        window = {field: self._values[i, end - n:end] for i, field in enumerate(self.FIELDS)}
+        window['timestamp'] = self._timestamps[end - n:end]
+        return window
+
+    def _write(self, slot: int, candle: Dict):
+        for i, field in enumerate(self.API_FIELDS):
+            value = float(candle[field])
+            self._values[i, slot] = value
+            self._values[i, slot + self.capacity] = value
+        timestamp = _epoch_seconds(candle['startedAt'])
+        self._timestamps[slot] = timestamp
+        self._timestamps[slot + self.capacity] = timestamp
+
+
 class MarketData:
     def __init__(self, client: DydxClientWrapper, market: str = config.DEFAULT_MARKET,
                  timeframe: str = config.DEFAULT_TIMEFRAME):
@@ -28,12 +171,48 @@ class MarketData:
         self.client = client
         self.market = market
         self.timeframe = timeframe
+        self.resolution = config.CANDLE_RESOLUTIONS.get(timeframe, timeframe)
         self.candles = pd.DataFrame()
         self.latest_price = 0.0
         self.ws = None
         self.ws_thread = None
         self.running = False
 
+        # Candles are streamed over the WebSocket in live mode only; simulation
+        # mode keeps using the client's synthetic REST candles.
+        self.stream_candles = not getattr(client, "simulation_mode", True)
+        self.streaming_candles = False
+        self.max_candles = 500
+
+        # Streamed candles, oldest first; the DataFrame view is rebuilt lazily
+        self._candle_buffer = CandleRingBuffer(self.max_candles)
+        self._candle_lock = threading.Lock()
+        self._candles_dirty = False
+
+        # (startedAt, OHLCV) of the last applied candle update
+        self._candle_sig = None
+
+        # Set by the WebSocket thread whenever the candles change
+        self._new_data = threading.Event()
+
+    @property
+    def candles(self) -> pd.DataFrame:
+        """
+        Candle history as a DataFrame sorted by timestamp.
+        """
+        if self._candles_dirty:
+            with self._candle_lock:
+                window = {col: values.copy() for col, values in self._candle_buffer.window().items()}
+                self._candles_dirty = False
+            window['timestamp'] = pd.to_datetime(window['timestamp'], unit='s', utc=True)
+            self._candles = pd.DataFrame(window, columns=['timestamp', *CandleRingBuffer.FIELDS])
+        return self._candles
+
+    @candles.setter
+    def candles(self, df: pd.DataFrame):
+        self._candles = df
+        self._candles_dirty = False
+
     def fetch_candles(self, limit: int = 100) -> pd.DataFrame:
         """
         Fetch historical candles from dYdX.
@@ -56,41 +235,116 @@ class MarketData:
                 logger.warning(f"No candles data received for {self.market}")
                 return pd.DataFrame()
 
-            candles_data = candles_response['candles']
-
-            # Convert to DataFrame
-            df = pd.DataFrame(candles_data)
+            df = self._candles_to_dataframe(candles_response['candles'])
 
             if df.empty:
                 logger.warning(f"Empty candles data for {self.market}")
                 return df
 
-            # Rename and convert columns
-            df = df.rename(columns={
-                'startedAt': 'timestamp',
-                'open': 'open',
-                'high': 'high',
-                'low': 'low',
-                'close': 'close',
-                'baseTokenVolume': 'volume'
-            })
-
-            # Convert types
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col])
-
-            # Sort by timestamp
-            df = df.sort_values('timestamp')
-
             self.candles = df
-            logger.info(f"Fetched {len(df)} candles for {self.market}")
+            logger.info("Fetched %d candles for %s", len(df), self.market)
             return df
 
         except Exception as e:
             logger.error(f"Failed to fetch candles: {str(e)}")
             return pd.DataFrame()
 
+    def _candles_to_dataframe(self, candles_data: List[Dict]) -> pd.DataFrame:
+        """
+        Convert raw indexer candles to a DataFrame sorted by timestamp.
+
+        Args:
+            candles_data: Candles as returned by the REST API or WebSocket
+
+        Returns:
+            DataFrame: Candle data with columns [timestamp, open, high, low, close, volume]
+        """
+        df = pd.DataFrame(candles_data)
+
+        if df.empty:
+            return df
+
+        # Rename and convert columns
+        df = df.rename(columns={
+            'startedAt': 'timestamp',
+            'open': 'open',
+            'high': 'high',
+            'low': 'low',
+            'close': 'close',
+            'baseTokenVolume': 'volume'
+        })
+
+        # Convert types
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col])
+
+        # Sort by timestamp
+        return df.sort_values('timestamp', ignore_index=True)
+
+    def is_streaming_candles(self, min_candles: int = 1) -> bool:
+        """
+        Check whether candles are currently kept up to date by the WebSocket.
+
+        Args:
+            min_candles: Minimum number of candles required
+
+        Returns:
+            bool: True if the streamed candles can be used instead of a REST fetch
+        """
+        return self.streaming_candles and len(self._candle_buffer) >= min_candles
+
+    def get_candle_window(self, periods: int) -> Dict[str, np.ndarray]:
+        """
+        Get the most recent candles as NumPy column arrays.
+
+        Streamed candles are read straight from the ring buffer without
+        building a DataFrame; otherwise the REST candles are used.
+
+        Args:
+            periods: Number of most recent candles
+
+        Returns:
+            Dict[str, np.ndarray]: 'open', 'high', 'low', 'close' and 'volume' arrays, oldest first
+        """
+        if self.streaming_candles:
+            with self._candle_lock:
+                if len(self._candle_buffer):
+                    return {col: values.copy() for col, values in self._candle_buffer.window(periods).items()}
+
+        candles = self.candles
+        if candles.empty:
+            return {col: np.empty(0, dtype=np.float64) for col in CandleRingBuffer.FIELDS}
+        return {col: candles[col].to_numpy(dtype=np.float64)[-periods:] for col in CandleRingBuffer.FIELDS}
+
+    def get_streamed_price(self) -> Optional[float]:
+        """
+        Get the latest price pushed by the WebSocket, without any API call.
+
+        Returns:
+            Optional[float]: Streamed price, or None when the live stream is not active
+        """
+        if self.streaming_candles and self.latest_price > 0:
+            return self.latest_price
+        return None
+
+    def wait_for_update(self, timeout: float) -> bool:
+        """
+        Block until the WebSocket delivers new candle data or the timeout expires.
+
+        Only the latest state is kept, so updates that arrive while the caller
+        is busy are coalesced into a single wake-up instead of queueing up.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            bool: True if new data arrived, False on timeout
+        """
+        updated = self._new_data.wait(timeout)
+        self._new_data.clear()
+        return updated
+
     def get_latest_price(self) -> float:
         """
         Get the latest price for the market.
@@ -99,9 +353,15 @@ class MarketData:
             float: Latest price
         """
         try:
+            # The WebSocket already keeps the price current
+            streamed_price = self.get_streamed_price()
+            if streamed_price is not None:
+                return streamed_price
+
             # Try to get latest price from recent candles
-            if not self.candles.empty:
-                self.latest_price = float(self.candles.iloc[-1]['close'])
+            candles = self.candles
+            if not candles.empty:
+                self.latest_price = float(candles['close'].to_numpy()[-1])
                 return self.latest_price
 
             # If no candles, fetch fresh data
@@ -134,7 +394,7 @@ class MarketData:
         self.ws_thread = threading.Thread(target=self._run_websocket)
         self.ws_thread.daemon = True
         self.ws_thread.start()
-        logger.info(f"Started WebSocket connection for {self.market}")
+        logger.info("Started WebSocket connection for %s", self.market)
 
     def stop_websocket(self):
         """
@@ -153,14 +413,17 @@ class MarketData:
 
         def on_message(ws, message):
             try:
-                data = json.loads(message)
-                if 'type' in data and data['type'] == 'channel_data':
+                data = json_loads(message)
+                if data.get('channel') == 'v4_candles':
+                    self._handle_candles_message(data)
+                elif 'type' in data and data['type'] == 'channel_data':
                     if 'contents' in data and 'trades' in data['contents']:
                         trades = data['contents']['trades']
                         if trades:
                             # Update latest price from the most recent trade
                             self.latest_price = float(trades[0]['price'])
-                            logger.debug(f"New price for {self.market}: {self.latest_price}")
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug("New price for %s: %s", self.market, self.latest_price)
             except Exception as e:
                 logger.error(f"WebSocket message error: {str(e)}")
 
@@ -168,7 +431,8 @@ class MarketData:
             logger.error(f"WebSocket error: {str(error)}")
 
         def on_close(ws, close_status_code, close_msg):
-            logger.info(f"WebSocket connection closed: {close_msg}")
+            logger.info("WebSocket connection closed: %s", close_msg)
+            self.streaming_candles = False
             if self.running:
                 logger.info("Attempting to reconnect WebSocket in 5 seconds...")
                 time.sleep(5)
@@ -184,6 +448,14 @@ class MarketData:
             }
             ws.send(json.dumps(subscribe_msg))
 
+            # Subscribe to candles so the strategy does not need to poll REST
+            if self.stream_candles:
+                ws.send(json.dumps({
+                    "type": "subscribe",
+                    "channel": "v4_candles",
+                    "id": f"{self.market}/{self.resolution}"
+                }))
+
         # Create WebSocket connection
         self.ws = websocket.WebSocketApp(
             ws_url,
@@ -196,6 +468,47 @@ class MarketData:
         # Run WebSocket connection
         self.ws.run_forever()
 
+    def _handle_candles_message(self, data: Dict):
+        """
+        Apply a candles channel message to the local candle history.
+
+        Args:
+            data: Parsed WebSocket message
+        """
+        contents = data.get('contents', {})
+
+        if data.get('type') == 'subscribed':
+            # Initial snapshot replaces the REST candles
+            candles_data = sorted(contents.get('candles', []), key=lambda c: c['startedAt'])
+            with self._candle_lock:
+                self._candle_buffer.clear()
+                self._candle_buffer.extend(candles_data)
+                self._candles_dirty = True
+            self._candle_sig = None
+            self.streaming_candles = True
+            self._new_data.set()
+            logger.info("Streaming %s candles for %s", self.resolution, self.market)
+
+        elif data.get('type') == 'channel_data' and contents:
+            # Re-sent candles with unchanged OHLCV would only wake the strategy
+            sig = (contents['startedAt'],) + tuple(contents[field] for field in CandleRingBuffer.API_FIELDS)
+            if sig == self._candle_sig:
+                return
+            self._candle_sig = sig
+
+            with self._candle_lock:
+                buffer = self._candle_buffer
+                if buffer.last_timestamp == _epoch_seconds(contents['startedAt']):
+                    # Update of the candle that is still forming
+                    buffer.replace_last(contents)
+                else:
+                    # The ring buffer overwrites the oldest candle in place
+                    buffer.push(contents)
+                self._candles_dirty = True
+
+            self.latest_price = float(contents['close'])
+            self._new_data.set()
+
     def _timeframe_to_seconds(self, timeframe: str) -> int:
         """
         Convert timeframe string to seconds.
@@ -1,9 +1,11 @@
 """
 Order execution and management module.
 """
+import itertools
 import logging
 import time
-from typing import Dict, Optional, List
+from datetime import datetime
+from typing import Callable, Dict, Optional, List
 
 from .dydx_client import DydxClientWrapper
 from . import config
@@ -12,10 +14,18 @@ from .data_manager import DataManager
 
 logger = logging.getLogger(__name__)
 
+# Seconds a fetched market price is reused before hitting the API again
+PRICE_CACHE_TTL = 0.5
+
+# Sequence that keeps simulated order ids unique within the same second
+_SIM_ORDER_SEQ = itertools.count(1)
+
 class OrderManager:
     def __init__(self, client: DydxClientWrapper, market: str = config.DEFAULT_MARKET,
                  position_size_usd: float = config.DEFAULT_POSITION_SIZE_USD,
-                 simulation_mode: bool = True):
+                 simulation_mode: bool = True,
+                 size_precision: int = config.DEFAULT_SIZE_PRECISION,
+                 price_source: Optional[Callable[[], Optional[float]]] = None):
         """
         Initialize the order manager.
 
@@ -24,13 +34,20 @@ class OrderManager:
             market: Market symbol (e.g., "ETH-USD")
             position_size_usd: Position size in USD
             simulation_mode: If True, don't place actual orders
+            size_precision: Decimal places to round order sizes to
+            price_source: Callable returning a streamed price or None (optional)
         """
         self.client = client
         self.market = market
         self.position_size_usd = position_size_usd
         self.simulation_mode = simulation_mode
+        self.size_precision = size_precision
+        self.price_source = price_source
         self.active_position = None
 
+        # Last fetched price as (monotonic time, price)
+        self._price_cache = (0.0, None)
+
         # Initialize risk manager and data manager
         self.risk_manager = RiskManager(client)
         self.data_manager = DataManager()
@@ -46,11 +63,14 @@ class OrderManager:
         Returns:
             Dict: Order information
         """
+        # Placing an order moves the market, so the next price read is fresh
+        self._price_cache = (0.0, None)
+
         # Calculate order size based on position size in USD and current price
         size = self.position_size_usd / price
 
         # Round size to appropriate precision
-        size = round(size, 4)  # Adjust precision as needed for the specific market
+        size = round(size, self.size_precision)
 
         order_info = {
             "market": self.market,
@@ -64,9 +84,9 @@ class OrderManager:
         }
 
         if self.simulation_mode:
-            logger.info(f"SIMULATION: Would place {side} order for {size} {self.market} @ {price}")
+            logger.info("SIMULATION: Would place %s order for %s %s @ %s", side, size, self.market, price)
             order_response = {
-                "order_id": f"sim_{int(time.time())}",
+                "order_id": f"sim_{int(time.time())}_{next(_SIM_ORDER_SEQ)}",
                 "status": "FILLED",
                 "simulation": True,
                 **order_info
@@ -77,7 +97,7 @@ class OrderManager:
                 order_response = self.client.place_order(order_info)
 
                 if order_response:
-                    logger.info(f"Placed {side} order for {size} {self.market} @ {price}")
+                    logger.info("Placed %s order for %s %s @ %s", side, size, self.market, price)
                 else:
                     logger.error("Order placement returned None")
                     order_response = {
@@ -131,6 +151,8 @@ class OrderManager:
         order_response = self.place_market_order("BUY", entry_price)
 
         if order_response.get("status") == "FILLED" or self.simulation_mode:
+            opened_at = time.time()
+
             # Create position object
             position = {
                 "market": self.market,
@@ -141,19 +163,20 @@ class OrderManager:
                 "take_profit": take_profit,
                 "status": "OPEN",
                 "order_id": order_response.get("order_id", ""),
-                "opened_at": time.time()
+                "opened_at": opened_at
             }
 
             self.active_position = position
+            self.risk_manager.invalidate_balance_cache()
 
             # Save position to data manager
-            self.data_manager.save_position(position)
+            self.data_manager.enqueue_position(position, timestamp=datetime.fromtimestamp(opened_at).isoformat())
 
-            logger.info(f"Opened LONG position: {position}")
+            logger.info("Opened LONG position: %s", position)
 
             return position
         else:
-            logger.error(f"Failed to open position: {order_response}")
+            logger.error("Failed to open position: %s", order_response)
             return {"status": "FAILED", "error": "Order not filled"}
 
     def close_position(self, reason: str) -> Dict:
@@ -176,6 +199,8 @@ class OrderManager:
         order_response = self.place_market_order("SELL", current_price)
 
         if order_response.get("status") == "FILLED" or self.simulation_mode:
+            closed_at = time.time()
+
             # Calculate profit/loss
             if self.active_position["side"] == "LONG":
                 pnl = (current_price - self.active_position["entry_price"]) * self.active_position["size"]
@@ -190,24 +215,25 @@ class OrderManager:
                 "exit_reason": reason,
                 "pnl": pnl,
                 "pnl_percent": (pnl / self.position_size_usd) * 100,
-                "closed_at": time.time(),
-                "duration": time.time() - self.active_position["opened_at"]
+                "closed_at": closed_at,
+                "duration": closed_at - self.active_position["opened_at"]
             }
 
             # Save completed trade
-            self.data_manager.save_trade(closed_position)
+            self.data_manager.enqueue_trade(closed_position)
 
             # Update risk manager with P&L
             self.risk_manager.update_daily_pnl(pnl)
 
-            logger.info(f"Closed position due to {reason}: {closed_position}")
+            logger.info("Closed position due to %s: %s", reason, closed_position)
 
             # Clear active position
             self.active_position = None
+            self.risk_manager.invalidate_balance_cache()
 
             return closed_position
         else:
-            logger.error(f"Failed to close position: {order_response}")
+            logger.error("Failed to close position: %s", order_response)
             return {"status": "FAILED", "error": "Order not filled"}
 
     def check_exit_conditions(self) -> Optional[str]:
@@ -237,9 +263,23 @@ class OrderManager:
         """
         Get the current price for the market.
 
+        A streamed price from price_source is preferred. The REST candle
+        fallback is cached for PRICE_CACHE_TTL seconds so that an exit check
+        followed by a close in the same tick costs a single API call.
+
         Returns:
             float: Current price
         """
+        if self.price_source is not None:
+            price = self.price_source()
+            if price is not None:
+                return price
+
+        now = time.monotonic()
+        cached_at, cached_price = self._price_cache
+        if cached_price is not None and now - cached_at < PRICE_CACHE_TTL:
+            return cached_price
+
         try:
             # Get latest candle data to determine current price
             candles_response = self.client.get_candles(
@@ -250,7 +290,9 @@ class OrderManager:
 
             if candles_response and 'candles' in candles_response and candles_response['candles']:
                 latest_candle = candles_response['candles'][0]
-                return float(latest_candle['close'])
+                price = float(latest_candle['close'])
+                self._price_cache = (now, price)
+                return price
 
             logger.warning(f"Could not get current price for {self.market}")
             # Return a fallback price if available
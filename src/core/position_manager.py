@@ -5,10 +5,39 @@ import logging
 import time
 from typing import Dict, Optional
 
+import numpy as np
+
 from ..utils.dydx_api import DydxApiClient
 
 logger = logging.getLogger(__name__)
 
+
+def calculate_pnl_batch(entry_prices: np.ndarray, exit_prices: np.ndarray,
+                        sizes: np.ndarray, sides: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculate profit/loss for many closed positions at once (e.g. in a backtest).
+
+    Matches PositionManager.close_position without branching per trade.
+
+    Args:
+        entry_prices: Entry prices
+        exit_prices: Exit prices
+        sizes: Position sizes in tokens
+        sides: Position sides ("LONG" or "SHORT")
+
+    Returns:
+        Dict[str, np.ndarray]: pnl and pnl_percent arrays
+    """
+    entry_prices = np.asarray(entry_prices, dtype=np.float64)
+    exit_prices = np.asarray(exit_prices, dtype=np.float64)
+    is_long = np.asarray(sides) == "LONG"
+
+    sign = np.where(is_long, 1.0, -1.0)
+    pnl = sign * (exit_prices - entry_prices) * np.asarray(sizes, dtype=np.float64)
+    pnl_percent = (np.where(is_long, exit_prices / entry_prices, entry_prices / exit_prices) - 1) * 100
+
+    return {"pnl": pnl, "pnl_percent": pnl_percent}
+
 class PositionManager:
     """
     Manages trading positions (simulated for now).
@@ -86,6 +115,8 @@ class PositionManager:
             pnl = (self.active_position["entry_price"] - exit_price) * self.active_position["size"]
             pnl_percent = ((self.active_position["entry_price"] / exit_price) - 1) * 100
 
+        closed_at = time.time()
+
         # Update position status
         closed_position = {
             **self.active_position,
@@ -94,8 +125,8 @@ class PositionManager:
             "exit_reason": reason,
             "pnl": pnl,
             "pnl_percent": pnl_percent,
-            "closed_at": time.time(),
-            "duration": time.time() - self.active_position["opened_at"]
+            "closed_at": closed_at,
+            "duration": closed_at - self.active_position["opened_at"]
         }
 
         logger.info(f"Closed position due to {reason}: {closed_position}")
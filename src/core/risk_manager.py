@@ -2,12 +2,16 @@
 Risk management module for the dYdX trading bot.
 """
 import logging
+import time
 from typing import Dict, Optional, Tuple
 from .dydx_client import DydxClientWrapper
 from . import config
 
 logger = logging.getLogger(__name__)
 
+# Seconds a fetched account balance is reused before querying again
+BALANCE_CACHE_TTL = 1.0
+
 class RiskManager:
     """
     Manages risk controls for trading operations.
@@ -35,6 +39,9 @@ class RiskManager:
         self.daily_pnl = 0.0
         self.initial_balance = 0.0
 
+        # Last fetched balance as (monotonic time, balance)
+        self._balance_cache = (0.0, None)
+
     def validate_position_size(self, position_size_usd: float, market: str) -> Tuple[bool, str]:
         """
         Validate if the position size is within risk limits.
@@ -79,17 +86,21 @@ class RiskManager:
 
         return True, "Daily loss within limits"
 
-    def validate_drawdown(self) -> Tuple[bool, str]:
+    def validate_drawdown(self, balance: Optional[float] = None) -> Tuple[bool, str]:
         """
         Validate if current drawdown is within limits.
 
+        Args:
+            balance: Current balance if already fetched by the caller
+
         Returns:
             Tuple[bool, str]: (is_valid, reason)
         """
+        current_balance = balance if balance is not None else self.get_available_balance()
+
         if self.initial_balance == 0:
-            self.initial_balance = self.get_available_balance() or 0
+            self.initial_balance = current_balance or 0
 
-        current_balance = self.get_available_balance()
         if current_balance is None or self.initial_balance == 0:
             return True, "Unable to calculate drawdown"
 
@@ -104,25 +115,41 @@ class RiskManager:
         """
         Get available balance from the account.
 
+        Balances are cached for BALANCE_CACHE_TTL seconds so back-to-back
+        risk checks share a single account query.
+
         Returns:
             Optional[float]: Available balance in USD or None if error
         """
+        fetched_at, balance = self._balance_cache
+        if balance is not None and time.monotonic() - fetched_at < BALANCE_CACHE_TTL:
+            return balance
+
         try:
             # Get account info using wrapper
             account_info = self.client.get_account_info()
 
             if account_info and 'equity' in account_info:
-                return float(account_info['equity'])
+                balance = float(account_info['equity'])
             elif account_info and 'freeCollateral' in account_info:
-                return float(account_info['freeCollateral'])
+                balance = float(account_info['freeCollateral'])
             else:
-                logger.warning(f"Could not determine balance from account info: {account_info}")
+                logger.warning("Could not determine balance from account info: %s", account_info)
                 return None
 
+            self._balance_cache = (time.monotonic(), balance)
+            return balance
+
         except Exception as e:
-            logger.error(f"Failed to get account balance: {str(e)}")
+            logger.error("Failed to get account balance: %s", e)
             return None
 
+    def invalidate_balance_cache(self):
+        """
+        Drop the cached balance (call after a fill changes the account).
+        """
+        self._balance_cache = (0.0, None)
+
     def update_daily_pnl(self, pnl: float):
         """
         Update the daily P&L tracking.
@@ -131,7 +158,7 @@ class RiskManager:
             pnl: Profit/Loss amount to add
         """
         self.daily_pnl += pnl
-        logger.info(f"Updated daily P&L: ${self.daily_pnl:.2f}")
+        logger.info("Updated daily P&L: $%.2f", self.daily_pnl)
 
     def reset_daily_pnl(self):
         """
@@ -166,7 +193,7 @@ class RiskManager:
             Dict: Risk summary
         """
         balance = self.get_available_balance()
-        drawdown_valid, drawdown_msg = self.validate_drawdown()
+        drawdown_valid, drawdown_msg = self.validate_drawdown(balance)
 
         return {
             "available_balance": balance,
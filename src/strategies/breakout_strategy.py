@@ -3,14 +3,68 @@ Breakout trading strategy implementation using direct REST API.
 """
 import logging
 import time
-import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
 from dydx_api import DydxApiClient
+from jit import NUMBA_AVAILABLE, njit
 
 logger = logging.getLogger(__name__)
 
+# Candle resolution lengths in seconds, under both the indexer's spelling
+# ("5MINS") and the singular one used by strategy defaults ("5MIN")
+RESOLUTION_SECONDS = {
+    "1MIN": 60,
+    "5MIN": 300,
+    "5MINS": 300,
+    "15MIN": 900,
+    "15MINS": 900,
+    "30MIN": 1800,
+    "30MINS": 1800,
+    "1HOUR": 3600,
+    "4HOUR": 14400,
+    "4HOURS": 14400,
+    "1DAY": 86400
+}
+
+# Candle length assumed for a resolution missing from RESOLUTION_SECONDS
+DEFAULT_RESOLUTION_SECONDS = 60
+
+# Fraction of a candle period for which fetched candles are reused
+CANDLE_CACHE_TTL_FRACTION = 0.5
+
+# Numeric candle fields kept from the API payload
+CANDLE_FIELDS = ("open", "high", "low", "close", "baseTokenVolume")
+
+# Fields every candle in the payload must carry
+CANDLE_SCHEMA = frozenset(CANDLE_FIELDS + ("startedAt",))
+
+
+@njit(cache=True)
+def _breakout_indicators(highs, volumes, periods):
+    """
+    Compute the highest high and the mean volume of the newest candles in one pass.
+
+    Args:
+        highs: Array of candle highs, newest first
+        volumes: Array of candle volumes, newest first
+        periods: Number of candles in the lookback window
+
+    Returns:
+        Tuple[float, float]: (resistance level, average volume)
+    """
+    n = min(periods, highs.shape[0])
+    resistance = highs[0]
+    total_volume = 0.0
+
+    for i in range(n):
+        if highs[i] > resistance:
+            resistance = highs[i]
+        total_volume += volumes[i]
+
+    return resistance, total_volume / n
+
 class BreakoutStrategy:
     """
     Breakout trading strategy with volume confirmation.
@@ -18,7 +72,8 @@ class BreakoutStrategy:
 
     def __init__(self, api_client: DydxApiClient, market_id: str,
                  timeframe: str = "5MIN", volume_factor: float = 2.0,
-                 resistance_periods: int = 24, risk_reward_ratio: float = 3.0):
+                 resistance_periods: int = 24, risk_reward_ratio: float = 3.0,
+                 candle_dtype: type = np.float64):
         """
         Initialize the breakout strategy.
 
@@ -29,6 +84,8 @@ class BreakoutStrategy:
             volume_factor: Factor by which volume should exceed average to confirm breakout
             resistance_periods: Number of periods to look back for resistance
             risk_reward_ratio: Risk-to-reward ratio for take profit calculation
+            candle_dtype: Float dtype of the stored candle arrays; np.float32 halves
+                memory traffic for long backtests (averages still accumulate in float64)
         """
         self.api_client = api_client
         self.market_id = market_id
@@ -36,13 +93,45 @@ class BreakoutStrategy:
         self.volume_factor = volume_factor
         self.resistance_periods = resistance_periods
         self.risk_reward_ratio = risk_reward_ratio
+        self.candle_dtype = candle_dtype
 
         # Strategy state
-        self.candles = pd.DataFrame()
+        self.candles: Dict[str, np.ndarray] = {}
+        self._candles_payload = None
+        self._candles_fetched_at = None
+        self._candles_ttl = self._resolution_seconds(timeframe) * CANDLE_CACHE_TTL_FRACTION
         self.resistance_level = 0.0
         self.average_volume = 0.0
+        self._volume_threshold = 0.0  # average_volume * volume_factor
         self.current_price = 0.0
 
+        # Fetches the market price while candles load; reused across refreshes
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def stop(self):
+        """
+        Shut down the worker thread used for concurrent market data requests.
+        """
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _resolution_seconds(timeframe: str) -> int:
+        """
+        Look up the length of one candle for a timeframe.
+
+        Args:
+            timeframe: Candle timeframe (e.g., "5MIN" or "5MINS")
+
+        Returns:
+            int: Candle length in seconds, DEFAULT_RESOLUTION_SECONDS if unknown
+        """
+        seconds = RESOLUTION_SECONDS.get(timeframe.upper())
+        if seconds is None:
+            logger.warning("Unknown candle resolution %s, assuming %ds candles for caching",
+                           timeframe, DEFAULT_RESOLUTION_SECONDS)
+            return DEFAULT_RESOLUTION_SECONDS
+        return seconds
+
     def update_market_data(self) -> bool:
         """
         Update market data and recalculate indicators.
@@ -51,56 +140,109 @@ class BreakoutStrategy:
             bool: True if data was updated successfully, False otherwise
         """
         try:
-            # Get candles from API
-            candles_data = self.api_client.get_candles(
-                market_id=self.market_id,
-                resolution=self.timeframe,
-                limit=max(100, self.resistance_periods + 10)
-            )
-
-            # Check if we got valid data
-            if "candles" not in candles_data or not candles_data["candles"]:
-                logger.error(f"Failed to get candles for {self.market_id}")
-                return False
-
-            # Convert to DataFrame
-            candles = pd.DataFrame(candles_data["candles"])
-
-            # Convert types
-            for col in ["open", "high", "low", "close", "baseTokenVolume"]:
-                if col in candles.columns:
-                    candles[col] = pd.to_numeric(candles[col])
-
-            # Sort by startedAt
-            if "startedAt" in candles.columns:
-                candles = candles.sort_values("startedAt", ascending=False)
-
-            self.candles = candles
-
-            # Calculate resistance level (highest high in the lookback period)
-            if "high" in candles.columns and len(candles) > 0:
-                self.resistance_level = candles["high"].head(self.resistance_periods).max()
-
-            # Calculate average volume
-            if "baseTokenVolume" in candles.columns and len(candles) > 0:
-                self.average_volume = candles["baseTokenVolume"].head(self.resistance_periods).mean()
+            # Recently fetched candles are reused; only the price is refreshed
+            now = time.monotonic()
+            if self._candles_fetched_at is None or now - self._candles_fetched_at >= self._candles_ttl:
+                # Fetch the market price concurrently with the candles
+                market_future = self._executor.submit(self.api_client.get_market, self.market_id)
+                candles_ok = self._fetch_candles()
+                market_data = market_future.result()
+
+                if not candles_ok:
+                    return False
+                self._candles_fetched_at = now
+            else:
+                market_data = self.api_client.get_market(self.market_id)
+
+            # Fetched candles are non-empty and schema-checked, so no per-column guards
+            candles = self.candles
+
+            if NUMBA_AVAILABLE:
+                # Fused compiled pass over the lookback window
+                resistance, average_volume = _breakout_indicators(
+                    candles["high"],
+                    candles["baseTokenVolume"],
+                    self.resistance_periods
+                )
+                self.resistance_level = float(resistance)
+                self.average_volume = float(average_volume)
+            else:
+                # Calculate resistance level (highest high in the lookback period)
+                self.resistance_level = float(candles["high"][:self.resistance_periods].max())
+
+                # Calculate average volume
+                self.average_volume = float(candles["baseTokenVolume"][:self.resistance_periods].mean(dtype=np.float64))
+
+            self._volume_threshold = self.average_volume * self.volume_factor
 
             # Get current price from market data
-            market_data = self.api_client.get_market(self.market_id)
             if "oraclePrice" in market_data:
                 self.current_price = float(market_data["oraclePrice"])
-            elif "close" in candles.columns and len(candles) > 0:
-                self.current_price = candles["close"].iloc[0]  # Most recent candle
+            else:
+                self.current_price = float(candles["close"][0])  # Most recent candle
 
-            logger.info(f"Updated market data - Resistance: {self.resistance_level:.2f}, "
-                       f"Avg Volume: {self.average_volume:.2f}, Current Price: {self.current_price:.2f}")
+            logger.info("Updated market data - Resistance: %.2f, Avg Volume: %.2f, Current Price: %.2f",
+                        self.resistance_level, self.average_volume, self.current_price)
 
             return True
 
         except Exception as e:
-            logger.error(f"Failed to update market data: {str(e)}")
+            logger.error("Failed to update market data: %s", e)
             return False
 
+    def _fetch_candles(self) -> bool:
+        """
+        Fetch candles from the API and rebuild the candle arrays if they changed.
+
+        Returns:
+            bool: True if valid candles were received, False otherwise
+        """
+        candles_data = self.api_client.get_candles(
+            market_id=self.market_id,
+            resolution=self.timeframe,
+            limit=max(100, self.resistance_periods + 10)
+        )
+
+        # Check if we got valid data
+        if "candles" not in candles_data or not candles_data["candles"]:
+            logger.error("Failed to get candles for %s", self.market_id)
+            return False
+
+        # The API client returns the same object for an unchanged payload,
+        # in which case the existing arrays are still current
+        if candles_data is not self._candles_payload:
+            raw = candles_data["candles"]
+            n = len(raw)
+
+            # Validate the schema once so indicator code needs no per-column checks
+            missing = CANDLE_SCHEMA.difference(raw[0])
+            if missing:
+                logger.error("Candles for %s are missing fields: %s", self.market_id, ", ".join(sorted(missing)))
+                return False
+
+            # Parse each numeric column in one pass straight into an ndarray
+            columns = {
+                col: np.fromiter((float(c[col]) for c in raw), dtype=self.candle_dtype, count=n)
+                for col in CANDLE_FIELDS
+            }
+            started_at = columns["startedAt"] = np.array([c["startedAt"] for c in raw])
+
+            # The indexer returns candles newest first; only re-sort if it did not
+            if not np.all(started_at[:-1] >= started_at[1:]):
+                order = np.argsort(started_at, kind="stable")[::-1]
+                columns = {col: values[order] for col, values in columns.items()}
+
+            self.candles = columns
+            self._candles_payload = candles_data
+
+        return True
+
+    def _num_candles(self) -> int:
+        """
+        Number of candles currently loaded.
+        """
+        return len(next(iter(self.candles.values()))) if self.candles else 0
+
     def check_breakout_signal(self) -> Tuple[bool, Dict]:
         """
         Check if there's a breakout signal based on price and volume.
@@ -109,20 +251,17 @@ class BreakoutStrategy:
             Tuple[bool, Dict]: Signal detected (True/False) and signal details
         """
         # Make sure we have data
-        if len(self.candles) == 0 or self.resistance_level == 0 or self.average_volume == 0:
+        if self._num_candles() == 0 or self.resistance_level == 0 or self.average_volume == 0:
             return False, {"error": "Insufficient data"}
 
-        # Get latest candle
-        latest_candle = self.candles.iloc[-1]
-
         # Check for breakout conditions
         price_breakout = self.current_price > self.resistance_level
 
         # Get current volume
-        current_volume = latest_candle["baseTokenVolume"] if "baseTokenVolume" in latest_candle else 0
+        current_volume = float(self.candles["baseTokenVolume"][-1])
 
         # Check volume confirmation
-        volume_confirmation = current_volume > (self.average_volume * self.volume_factor)
+        volume_confirmation = current_volume > self._volume_threshold
 
         # Signal is valid if both price breaks resistance and volume is high
         signal = price_breakout and volume_confirmation
@@ -139,11 +278,34 @@ class BreakoutStrategy:
         }
 
         if signal:
-            logger.info(f"BREAKOUT SIGNAL DETECTED! Price: {self.current_price:.2f} > Resistance: {self.resistance_level:.2f}, "
-                       f"Volume: {current_volume:.2f} > Avg*Factor: {self.average_volume * self.volume_factor:.2f}")
+            logger.info("BREAKOUT SIGNAL DETECTED! Price: %.2f > Resistance: %.2f, Volume: %.2f > Avg*Factor: %.2f",
+                        self.current_price, self.resistance_level, current_volume, self._volume_threshold)
 
         return signal, signal_details
 
+    def calculate_rolling_indicators(self) -> Dict[str, np.ndarray]:
+        """
+        Calculate resistance and average volume for every lookback window in the candles.
+
+        Uses strided window views over the column arrays, so backtests get the
+        whole history in two vectorized reductions instead of one pass per candle.
+
+        Returns:
+            Dict[str, np.ndarray]: 'resistance' and 'average_volume' arrays; element i
+                covers the resistance_periods candles starting at row i (newest first)
+        """
+        n = self.resistance_periods
+        if self._num_candles() < n:
+            return {"resistance": np.empty(0), "average_volume": np.empty(0)}
+
+        highs = self.candles["high"]
+        volumes = self.candles["baseTokenVolume"]
+
+        return {
+            "resistance": np.lib.stride_tricks.sliding_window_view(highs, n).max(axis=1),
+            "average_volume": np.lib.stride_tricks.sliding_window_view(volumes, n).mean(axis=1, dtype=np.float64)
+        }
+
     def calculate_entry_exit_levels(self) -> Dict:
         """
         Calculate entry, stop loss, and take profit levels.
@@ -170,7 +332,8 @@ class BreakoutStrategy:
             "risk_reward_ratio": self.risk_reward_ratio
         }
 
-        logger.info(f"Position levels calculated - Entry: {self.current_price:.2f}, SL: {stop_loss:.2f}, TP: {take_profit:.2f}, "
-                   f"Risk: {risk:.2f}, Reward: {risk * self.risk_reward_ratio:.2f}, R:R = 1:{self.risk_reward_ratio}")
+        logger.info("Position levels calculated - Entry: %.2f, SL: %.2f, TP: %.2f, Risk: %.2f, Reward: %.2f, R:R = 1:%s",
+                    self.current_price, stop_loss, take_profit, risk, risk * self.risk_reward_ratio,
+                    self.risk_reward_ratio)
 
         return levels
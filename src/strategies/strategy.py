@@ -3,14 +3,38 @@ Breakout trading strategy implementation.
 """
 import logging
 import numpy as np
-import pandas as pd
 from typing import Dict, Tuple, Optional
 
 from ..core import config
 from ..core.market_data import MarketData
+from ..utils.jit import NUMBA_AVAILABLE, njit
 
 logger = logging.getLogger(__name__)
 
+
+@njit(cache=True)
+def _breakout_indicators(highs, volumes):
+    """
+    Compute the highest high and the mean volume of a candle window in one pass.
+
+    Args:
+        highs: Array of candle highs
+        volumes: Array of candle volumes, same length as highs
+
+    Returns:
+        Tuple[float, float]: (resistance level, average volume)
+    """
+    resistance = highs[0]
+    total_volume = 0.0
+
+    for i in range(highs.shape[0]):
+        if highs[i] > resistance:
+            resistance = highs[i]
+        total_volume += volumes[i]
+
+    return resistance, total_volume / volumes.shape[0]
+
+
 class BreakoutStrategy:
     def __init__(self, market_data: MarketData,
                  volume_factor: float = config.DEFAULT_VOLUME_FACTOR,
@@ -31,22 +55,32 @@ class BreakoutStrategy:
         self.risk_reward_ratio = risk_reward_ratio
         self.resistance_level = 0.0
         self.average_volume = 0.0
+        self._volume_threshold = 0.0  # average_volume * volume_factor
 
     def update_market_data(self):
         """
         Update market data and recalculate indicators.
         """
-        # Fetch latest candles
-        self.market_data.fetch_candles(limit=max(100, self.resistance_periods + 10))
+        # Fetch latest candles unless the WebSocket keeps them up to date
+        if not self.market_data.is_streaming_candles(min_candles=self.resistance_periods):
+            self.market_data.fetch_candles(limit=max(100, self.resistance_periods + 10))
+
+        window = self.market_data.get_candle_window(self.resistance_periods)
 
-        if len(self.market_data.candles) > 0:
-            # Calculate resistance level (highest high in the lookback period)
-            self.resistance_level = self.market_data.candles['high'].tail(self.resistance_periods).max()
+        if len(window['high']) > 0:
+            if NUMBA_AVAILABLE:
+                # Fused compiled pass over the window
+                resistance, average_volume = _breakout_indicators(window['high'], window['volume'])
+            else:
+                # Highest high in the lookback period and its average volume
+                resistance, average_volume = window['high'].max(), window['volume'].mean()
 
-            # Calculate average volume
-            self.average_volume = self.market_data.candles['volume'].tail(self.resistance_periods).mean()
+            self.resistance_level = float(resistance)
+            self.average_volume = float(average_volume)
+            self._volume_threshold = self.average_volume * self.volume_factor
 
-            logger.info(f"Updated indicators - Resistance: {self.resistance_level:.2f}, Avg Volume: {self.average_volume:.2f}")
+            logger.info("Updated indicators - Resistance: %.2f, Avg Volume: %.2f",
+                        self.resistance_level, self.average_volume)
 
     def check_breakout_signal(self) -> Tuple[bool, Dict]:
         """
@@ -59,15 +93,12 @@ class BreakoutStrategy:
         current_price = self.market_data.get_latest_price()
 
         # Get latest candle's volume
-        if len(self.market_data.candles) > 0:
-            latest_candle = self.market_data.candles.iloc[-1]
-            current_volume = latest_candle['volume']
-        else:
-            current_volume = 0
+        volumes = self.market_data.get_candle_window(1)['volume']
+        current_volume = float(volumes[-1]) if len(volumes) > 0 else 0
 
         # Check for breakout conditions
         price_breakout = current_price > self.resistance_level
-        volume_confirmation = current_volume > (self.average_volume * self.volume_factor)
+        volume_confirmation = current_volume > self._volume_threshold
 
         # Signal is valid if both price breaks resistance and volume is high
         signal = price_breakout and volume_confirmation
@@ -84,8 +115,8 @@ class BreakoutStrategy:
         }
 
         if signal:
-            logger.info(f"BREAKOUT SIGNAL DETECTED! Price: {current_price:.2f} > Resistance: {self.resistance_level:.2f}, "
-                       f"Volume: {current_volume:.2f} > Avg*Factor: {self.average_volume * self.volume_factor:.2f}")
+            logger.info("BREAKOUT SIGNAL DETECTED! Price: %.2f > Resistance: %.2f, Volume: %.2f > Avg*Factor: %.2f",
+                        current_price, self.resistance_level, current_volume, self._volume_threshold)
 
         return signal, signal_details
 
@@ -101,7 +132,7 @@ class BreakoutStrategy:
         """
         # Stop loss is just below the resistance level (which becomes support after breakout)
         # Using 1% below resistance as a simple approach
-        stop_loss = self.resistance_level * 0.99
+        stop_loss = self.resistance_level * config.STOP_LOSS_FACTOR
 
         # Risk is the difference between entry and stop loss
         risk = entry_price - stop_loss
@@ -118,7 +149,35 @@ class BreakoutStrategy:
             "risk_reward_ratio": self.risk_reward_ratio
         }
 
-        logger.info(f"Position levels calculated - Entry: {entry_price:.2f}, SL: {stop_loss:.2f}, TP: {take_profit:.2f}, "
-                   f"Risk: {risk:.2f}, Reward: {risk * self.risk_reward_ratio:.2f}, R:R = 1:{self.risk_reward_ratio}")
+        logger.info("Position levels calculated - Entry: %.2f, SL: %.2f, TP: %.2f, Risk: %.2f, Reward: %.2f, R:R = 1:%s",
+                    entry_price, stop_loss, take_profit, risk, risk * self.risk_reward_ratio,
+                    self.risk_reward_ratio)
 
         return levels
+
+    def calculate_entry_exit_levels_batch(self, entry_prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calculate stop loss and take profit levels for many candidate entries.
+
+        Vectorized counterpart of calculate_entry_exit_levels for backtests
+        and parameter sweeps; nothing is logged per entry.
+
+        Args:
+            entry_prices: Array of entry prices
+
+        Returns:
+            Dict[str, np.ndarray]: Entry, stop loss, take profit, risk and reward arrays
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+
+        stop_loss = np.full_like(entry_prices, self.resistance_level * config.STOP_LOSS_FACTOR)
+        risk = entry_prices - stop_loss
+        reward = risk * self.risk_reward_ratio
+
+        return {
+            "entry_price": entry_prices,
+            "stop_loss": stop_loss,
+            "take_profit": entry_prices + reward,
+            "risk": risk,
+            "reward": reward
+        }
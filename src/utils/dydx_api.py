@@ -1,11 +1,21 @@
 """
 dYdX v4 API client using direct REST API calls.
 """
+import json
 import logging
+import random
 import requests
+import threading
 import time
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Any, Union
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    json_loads = json.loads
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -14,12 +24,30 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connection pool sizing for sessions created by the client
+HTTP_POOL_CONNECTIONS = 4  # Distinct hosts kept pooled
+HTTP_POOL_MAXSIZE = 16  # Reusable connections per host
+
+# (connect, read) timeouts in seconds so a stalled node cannot hang the bot
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Retries of idempotent GETs on timeouts, connection errors and 5xx
+MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 0.5  # Seconds, doubled per attempt and jittered
+RETRY_BACKOFF_MAX = 8.0
+
+# Consecutive failures that open the circuit breaker, and how long it stays open
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
 class DydxApiClient:
     """
     Client for interacting with the dYdX v4 API.
     """
 
-    def __init__(self, base_url: str = "https://dydx-testnet.imperator.co/v4"):
+    def __init__(self, base_url: str = "https://dydx-testnet.imperator.co/v4",
+                 session: Optional[requests.Session] = None,
+                 timeout: Union[float, tuple] = REQUEST_TIMEOUT):
         """
         Initialize the dYdX API client.
 
@@ -27,15 +55,50 @@ class DydxApiClient:
             base_url: Base URL for the dYdX API
                 For testnet: "https://dydx-testnet.imperator.co/v4"
                 For mainnet: "https://indexer.dydx.trade/v4"
+            session: Shared HTTP session to reuse pooled connections (optional)
+            timeout: Request timeout in seconds, or a (connect, read) tuple
         """
         self.base_url = base_url
-        self.session = requests.Session()
+        self.timeout = timeout
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            # Size the pool for concurrent calls so none falls back to a new handshake
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+        # Last GET response per request as (etag, raw body, parsed data)
+        self._response_cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
+
+        # GET requests in flight, keyed like the response cache
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Circuit breaker state, shared by concurrent requests
+        self._consecutive_failures = 0
+        self._breaker_open_until = 0.0
+        self._breaker_lock = threading.Lock()
+
+    def close(self):
+        """
+        Close the HTTP session if this client created it.
+
+        Shared sessions are left open for their owner to close.
+        """
+        if self._owns_session:
+            self.session.close()
 
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
                      data: Optional[Dict] = None, headers: Optional[Dict] = None) -> Dict:
         """
         Make a request to the dYdX API.
 
+        Identical GETs issued concurrently from several threads share a
+        single HTTP request and receive the same result.
+
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint
@@ -44,26 +107,155 @@ class DydxApiClient:
             headers: Request headers
 
         Returns:
-            Dict: Response data
+            Dict: Response data. A GET whose payload is unchanged (HTTP 304 or
+                identical body) returns the same object as the previous call.
         """
         url = f"{self.base_url}/{endpoint}"
 
+        with self._breaker_lock:
+            breaker_open = time.monotonic() < self._breaker_open_until
+        if breaker_open:
+            return {"error": "Circuit breaker open, request skipped"}
+
+        if method != "GET":
+            return self._fetch(method, url, params, data, headers)
+
+        cache_key = (url, tuple(sorted(params.items())) if params else ())
+
+        # Join an identical request that is already in flight
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            leader = future is None
+            if leader:
+                future = self._inflight[cache_key] = Future()
+        if not leader:
+            return future.result()
+
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data,
-                headers=headers
-            )
+            result = self._fetch(method, url, params, data, headers, cache_key)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+
+    def _fetch(self, method: str, url: str, params: Optional[Dict], data: Optional[Dict],
+               headers: Optional[Dict], cache_key: Optional[tuple] = None) -> Dict:
+        """
+        Perform a request and decode the response.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            params: Query parameters
+            data: Request body
+            headers: Request headers
+            cache_key: Response cache key for GET requests
+
+        Returns:
+            Dict: Response data, or the cached object if the payload is unchanged
+        """
+        # Unchanged GET responses return the previously parsed object
+        cached = None
+        if cache_key is not None:
+            with self._cache_lock:
+                cached = self._response_cache.get(cache_key)
+            if cached is not None and cached[0]:
+                headers = {**(headers or {}), "If-None-Match": cached[0]}
+
+        try:
+            response = self._send(method, url, params, data, headers)
+
+            if cached is not None and response.status_code == 304:
+                return cached[2]
 
             response.raise_for_status()
-            return response.json()
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {str(e)}")
+            body = response.content
+            if cache_key is None:
+                return json_loads(body)
+
+            if cached is not None and cached[1] == body:
+                return cached[2]
+
+            result = json_loads(body)
+            with self._cache_lock:
+                self._response_cache[cache_key] = (response.headers.get("ETag"), body, result)
+            return result
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("API request failed: %s", e)
             return {"error": str(e)}
 
+    def _send(self, method: str, url: str, params: Optional[Dict],
+              data: Optional[Dict], headers: Optional[Dict]) -> requests.Response:
+        """
+        Send a request, retrying transient failures of GET requests.
+
+        Timeouts, connection errors and 5xx responses are retried with
+        jittered exponential backoff. Requests with side effects are sent once.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            params: Query parameters
+            data: Request body
+            headers: Request headers
+
+        Returns:
+            requests.Response: The last response received
+        """
+        attempts = MAX_RETRIES + 1 if method == "GET" else 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=data,
+                    headers=headers,
+                    timeout=self.timeout
+                )
+                if response.status_code < 500:
+                    with self._breaker_lock:
+                        self._consecutive_failures = 0
+                    return response
+                if self._record_failure() or last_attempt:
+                    return response
+                error = f"HTTP {response.status_code}"
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if self._record_failure() or last_attempt:
+                    raise
+                error = str(e)
+
+            delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.5)
+            logger.warning("Request to %s failed (%s), retrying in %.2fs", url, error, delay)
+            time.sleep(delay)
+
+    def _record_failure(self) -> bool:
+        """
+        Count a failed request and open the circuit breaker past the threshold.
+
+        Returns:
+            bool: True if the circuit breaker is now open
+        """
+        with self._breaker_lock:
+            self._consecutive_failures += 1
+            failures = self._consecutive_failures
+            if failures < BREAKER_FAILURE_THRESHOLD:
+                return False
+            self._breaker_open_until = time.monotonic() + BREAKER_COOLDOWN
+
+        logger.warning("Circuit breaker opened for %.0fs after %d consecutive failures",
+                       BREAKER_COOLDOWN, failures)
+        return True
+
     def get_height(self) -> Dict:
         """
         Get the current block height and time.
@@ -0,0 +1,22 @@
+"""
+Optional Numba JIT support for numeric hot paths.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional, fall back to plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        No-op stand-in for numba.njit when numba is not installed.
+
+        Supports both the bare ``@njit`` and the ``@njit(cache=True)`` forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
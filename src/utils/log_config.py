@@ -0,0 +1,52 @@
+"""
+Logging setup shared by the bot entry points.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+
+# Log file rotation
+LOG_MAX_BYTES = 10_000_000  # Rotate the log file past this size
+LOG_BACKUP_COUNT = 5  # Rotated log files kept
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(log_file: str, level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue drained by a background listener.
+
+    The listener owns a rotating file handler and a console handler, so
+    file I/O never blocks the trading loop. Handlers already installed on
+    the root logger (e.g. by a module-level basicConfig call) are replaced.
+
+    Args:
+        log_file: Path of the log file
+        level: Root logger level
+
+    Returns:
+        logging.handlers.QueueListener: The started listener, stopped at exit
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        logging.handlers.RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES,
+                                             backupCount=LOG_BACKUP_COUNT, encoding='utf-8'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    return listener
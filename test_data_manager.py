@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for DataManager persistence.
+
+Every test works in its own temporary data directory, so the tracked
+files under data/ are never touched.
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core.data_manager import DataManager, WRITE_BATCH_SIZE
+
+
+def _iso_days_ago(days: int) -> str:
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+def test_cleanup_with_nan_pnl():
+    """Cleanup prunes old trades even when a trade has a NaN P&L."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        dm = DataManager(data_dir=data_dir)
+        dm.save_trade({"market": "ETH-USD", "pnl": float('nan')}, timestamp=_iso_days_ago(60))
+        dm.save_trade({"market": "ETH-USD", "pnl": 5.0}, timestamp=_iso_days_ago(1))
+
+        dm.cleanup_old_data(days_to_keep=30)
+
+        trades = dm.load_trades()
+        assert len(trades) == 1
+        assert trades[0]["pnl"] == 5.0
+
+
+def test_cleanup_keeps_file_layout():
+    """Cleanup writes the same indented layout as every other save."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        dm = DataManager(data_dir=data_dir)
+        old = {"market": "ETH-USD", "pnl": 1.0, "timestamp": _iso_days_ago(60)}
+        recent = [{"market": "ETH-USD", "pnl": 2.0, "timestamp": _iso_days_ago(1)},
+                  {"market": "BTC-USD", "pnl": -1.0, "timestamp": _iso_days_ago(2)}]
+        dm._write_json(dm.trades_file, [old] + recent)
+
+        dm.cleanup_old_data(days_to_keep=30)
+
+        with open(dm.trades_file) as f:
+            assert f.read() == json.dumps(recent, indent=2)
+
+
+def test_save_keeps_file_mode():
+    """Atomic saves keep the existing file's permissions."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        dm = DataManager(data_dir=data_dir)
+        dm.save_trade({"market": "ETH-USD", "pnl": 1.0})
+        os.chmod(dm.trades_file, 0o644)
+
+        dm.save_trade({"market": "ETH-USD", "pnl": 2.0})
+
+        assert os.stat(dm.trades_file).st_mode & 0o777 == 0o644
+
+
+def test_enqueue_flush_writes_files():
+    """Queued trades and positions reach disk once flush returns."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        dm = DataManager(data_dir=data_dir)
+        try:
+            for i in range(3):
+                dm.enqueue_trade({"market": "ETH-USD", "pnl": float(i)})
+            dm.enqueue_position({"order_id": "a", "status": "OPEN"})
+            dm.enqueue_position({"order_id": "a", "status": "CLOSED"})
+            dm.enqueue_position({"order_id": "b", "status": "OPEN"})
+            dm.flush()
+
+            with open(dm.trades_file) as f:
+                trades = json.load(f)
+            with open(dm.positions_file) as f:
+                positions = json.load(f)
+        finally:
+            dm.close()
+
+        assert [t["pnl"] for t in trades] == [0.0, 1.0, 2.0]
+        assert all("timestamp" in t for t in trades)
+        assert [(p["order_id"], p["status"]) for p in positions] == [("a", "CLOSED"), ("b", "OPEN")]
+
+
+def test_close_is_idempotent():
+    """close() can be called repeatedly, and writes after a close still land."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        dm = DataManager(data_dir=data_dir)
+        dm.close()
+
+        dm.enqueue_trade({"market": "ETH-USD", "pnl": 1.0})
+        dm.close()
+        dm.close()
+        assert len(dm.load_trades()) == 1
+
+        dm.enqueue_trade({"market": "ETH-USD", "pnl": 2.0})
+        dm.close()
+        assert [t["pnl"] for t in dm.load_trades()] == [1.0, 2.0]
+
+
+class _BatchRecordingDataManager(DataManager):
+    """DataManager that records the size of every trade batch it writes."""
+
+    def __init__(self, data_dir: str):
+        super().__init__(data_dir=data_dir)
+        self.batch_sizes = []
+
+    def _save_trades(self, new_trades):
+        self.batch_sizes.append(len(new_trades))
+        super()._save_trades(new_trades)
+
+
+def test_batches_are_capped():
+    """A burst is coalesced into writes of at most WRITE_BATCH_SIZE records."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        dm = _BatchRecordingDataManager(data_dir)
+        count = 2 * WRITE_BATCH_SIZE + 50
+        try:
+            for i in range(count):
+                dm.enqueue_trade({"market": "ETH-USD", "pnl": float(i)})
+            dm.flush()
+        finally:
+            dm.close()
+
+        assert sum(dm.batch_sizes) == count
+        assert max(dm.batch_sizes) <= WRITE_BATCH_SIZE
+        assert len(dm.batch_sizes) < count  # bursts were coalesced
+        assert [t["pnl"] for t in dm.load_trades()] == [float(i) for i in range(count)]
+
+
+def test_exit_flush_does_not_log_writes():
+    """The atexit flush writes queued trades without logging each one."""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    dm_logger = logging.getLogger("src.core.data_manager")
+    dm_logger.addHandler(handler)
+    level = dm_logger.level
+    dm_logger.setLevel(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        dm = DataManager(data_dir=data_dir)
+        try:
+            dm.enqueue_trade({"market": "ETH-USD", "pnl": 1.0})
+            dm._close_at_exit()
+        finally:
+            dm_logger.removeHandler(handler)
+            dm_logger.setLevel(level)
+
+        assert len(dm.load_trades()) == 1
+        assert not [r for r in records if r.getMessage().startswith("Saved trade")]
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_cleanup_with_nan_pnl,
+        test_cleanup_keeps_file_layout,
+        test_save_keeps_file_mode,
+        test_enqueue_flush_writes_files,
+        test_close_is_idempotent,
+        test_batches_are_capped,
+        test_exit_flush_does_not_log_writes,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Tests for the REST API client, run against a stub HTTP session.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+import requests
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils import dydx_api
+from src.utils.dydx_api import DydxApiClient, BREAKER_FAILURE_THRESHOLD, MAX_RETRIES
+
+
+def _response(status_code: int = 200, body: bytes = b'{}', etag: str = None) -> requests.Response:
+    """Build a requests.Response without touching the network."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    if etag:
+        response.headers['ETag'] = etag
+    return response
+
+
+class StubSession:
+    """
+    Stand-in for requests.Session that replays scripted responses.
+
+    Each scripted item is a Response to return or an exception to raise.
+    """
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = []
+
+    def request(self, method, url, params=None, json=None, headers=None, timeout=None):
+        self.calls.append({"method": method, "url": url, "params": params, "headers": headers})
+        item = self.script.pop(0)
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self):
+        pass
+
+
+def test_not_modified_reuses_cached_object():
+    """A 304 answer returns the previously parsed object and sends If-None-Match."""
+    session = StubSession(_response(body=b'{"height": "1"}', etag='"v1"'), _response(304, b''))
+    client = DydxApiClient(session=session)
+
+    first = client.get_height()
+    second = client.get_height()
+
+    assert first == {"height": "1"}
+    assert second is first
+    assert session.calls[1]["headers"]["If-None-Match"] == '"v1"'
+
+
+def test_identical_body_reuses_cached_object():
+    """An unchanged body without an ETag returns the previously parsed object."""
+    body = b'{"candles": [{"close": "1.0"}]}'
+    session = StubSession(_response(body=body), _response(body=body), _response(body=b'{"candles": []}'))
+    client = DydxApiClient(session=session)
+
+    first = client.get_candles("ETH-USD")
+    second = client.get_candles("ETH-USD")
+    third = client.get_candles("ETH-USD")
+
+    assert second is first
+    assert third == {"candles": []}
+    assert third is not first
+
+
+def test_cache_is_keyed_by_params():
+    """Requests with different parameters never share a cached response."""
+    session = StubSession(_response(body=b'{"candles": [1]}'), _response(body=b'{"candles": [1]}'))
+    client = DydxApiClient(session=session)
+
+    first = client.get_candles("ETH-USD", limit=10)
+    second = client.get_candles("ETH-USD", limit=20)
+
+    assert second is not first
+    assert "If-None-Match" not in (session.calls[1]["headers"] or {})
+
+
+class _NoBackoff:
+    """Context manager that disables retry sleeps while a test runs."""
+
+    def __enter__(self):
+        self.base = dydx_api.RETRY_BACKOFF_BASE
+        dydx_api.RETRY_BACKOFF_BASE = 0.0
+
+    def __exit__(self, *exc_info):
+        dydx_api.RETRY_BACKOFF_BASE = self.base
+
+
+def test_get_retries_transient_failures():
+    """Connection errors and 5xx answers to a GET are retried until one succeeds."""
+    session = StubSession(requests.exceptions.ConnectionError("reset"), _response(502),
+                          _response(body=b'{"height": "7"}'))
+    client = DydxApiClient(session=session)
+
+    with _NoBackoff():
+        result = client.get_height()
+
+    assert result == {"height": "7"}
+    assert len(session.calls) == 3
+    assert client._consecutive_failures == 0
+
+
+def test_post_is_not_retried():
+    """Requests with side effects are sent exactly once."""
+    session = StubSession(_response(503), _response(body=b'{}'))
+    client = DydxApiClient(session=session)
+
+    with _NoBackoff():
+        result = client._make_request("POST", "orders", data={"size": "1"})
+
+    assert "error" in result
+    assert len(session.calls) == 1
+
+
+def test_breaker_opens_after_threshold():
+    """Consecutive failures open the breaker, which then skips requests."""
+    failures = [requests.exceptions.ConnectionError("down") for _ in range(BREAKER_FAILURE_THRESHOLD)]
+    session = StubSession(*failures)
+    client = DydxApiClient(session=session)
+
+    with _NoBackoff():
+        first = client.get_height()
+        second = client.get_height()
+        third = client.get_height()
+
+    # The first call exhausts its retries below the threshold; the second trips it
+    assert MAX_RETRIES + 1 < BREAKER_FAILURE_THRESHOLD
+    assert "error" in first and "error" in second
+    assert len(session.calls) == BREAKER_FAILURE_THRESHOLD
+    assert third == {"error": "Circuit breaker open, request skipped"}
+
+
+def test_breaker_closes_after_cooldown():
+    """Once the cooldown has passed, requests go out again and success resets it."""
+    session = StubSession(_response(body=b'{"height": "1"}'))
+    client = DydxApiClient(session=session)
+    client._consecutive_failures = BREAKER_FAILURE_THRESHOLD
+    client._breaker_open_until = time.monotonic() - 1
+
+    assert client.get_height() == {"height": "1"}
+    assert client._consecutive_failures == 0
+
+
+def test_breaker_counts_concurrent_failures():
+    """Failures recorded from many threads are never lost."""
+    client = DydxApiClient(session=StubSession())
+    threads_count, per_thread = 8, 2000
+
+    def record():
+        for _ in range(per_thread):
+            client._record_failure()
+
+    # Every failure past the threshold logs a warning; keep the run quiet
+    level = dydx_api.logger.level
+    dydx_api.logger.setLevel(logging.ERROR)
+    try:
+        threads = [threading.Thread(target=record) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        dydx_api.logger.setLevel(level)
+
+    assert client._consecutive_failures == threads_count * per_thread
+
+
+class BlockingSession(StubSession):
+    """Stub session whose requests wait until the test releases them."""
+
+    def __init__(self, *script):
+        super().__init__(*script)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def request(self, *args, **kwargs):
+        self.entered.set()
+        assert self.release.wait(timeout=5)
+        return super().request(*args, **kwargs)
+
+
+def _run_concurrently(client, count):
+    """Issue count identical GETs while the first one is still in flight."""
+    results = [None] * count
+    errors = [None] * count
+
+    def call(i):
+        try:
+            results[i] = client._make_request("GET", "height")
+        except BaseException as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    threads[0].start()
+    assert client.session.entered.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+
+    # Wait until every follower is blocked on the in-flight request's result
+    future = next(iter(client._inflight.values()))
+    deadline = time.monotonic() + 5
+    while len(future._condition._waiters) < count - 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    client.session.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results, errors
+
+
+def test_concurrent_gets_share_one_request():
+    """Identical GETs in flight at the same time make a single upstream call."""
+    session = BlockingSession(_response(body=b'{"height": "3"}'))
+    client = DydxApiClient(session=session)
+
+    results, errors = _run_concurrently(client, 5)
+
+    assert errors == [None] * 5
+    assert len(session.calls) == 1
+    assert all(result is results[0] for result in results)
+    assert results[0] == {"height": "3"}
+    assert not client._inflight
+
+
+def test_concurrent_gets_share_exceptions():
+    """An unexpected error in the shared request reaches every waiting caller."""
+    session = BlockingSession(RuntimeError("boom"))
+    client = DydxApiClient(session=session)
+
+    results, errors = _run_concurrently(client, 4)
+
+    assert len(session.calls) == 1
+    assert all(isinstance(e, RuntimeError) and str(e) == "boom" for e in errors)
+    assert results == [None] * 4
+    assert not client._inflight
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_not_modified_reuses_cached_object,
+        test_identical_body_reuses_cached_object,
+        test_cache_is_keyed_by_params,
+        test_get_retries_transient_failures,
+        test_post_is_not_retried,
+        test_breaker_opens_after_threshold,
+        test_breaker_closes_after_cooldown,
+        test_breaker_counts_concurrent_failures,
+        test_concurrent_gets_share_one_request,
+        test_concurrent_gets_share_exceptions,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
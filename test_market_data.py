@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the streamed candle ring buffer.
+
+Each test checks CandleRingBuffer against a plain list of the candles
+that should be kept.
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.core.market_data import CandleRingBuffer
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _candle(i: int, close: float = None) -> dict:
+    """Indexer-style candle whose values are derived from its index."""
+    price = 100.0 + i
+    return {
+        "startedAt": (START + timedelta(minutes=i)).isoformat().replace('+00:00', 'Z'),
+        "open": str(price),
+        "high": str(price + 1),
+        "low": str(price - 1),
+        "close": str(price if close is None else close),
+        "baseTokenVolume": str(10.0 * i)
+    }
+
+
+def _assert_matches(buffer: CandleRingBuffer, expected: list, periods: int = None):
+    """Check the buffer's window against the expected candles, oldest first."""
+    if periods is not None:
+        expected = expected[-periods:] if periods else []
+    window = buffer.window(periods)
+
+    assert len(window['close']) == len(expected)
+    for field, api_field in zip(CandleRingBuffer.FIELDS, CandleRingBuffer.API_FIELDS):
+        assert np.array_equal(window[field], [float(c[api_field]) for c in expected]), field
+    timestamps = [datetime.fromisoformat(c['startedAt'].replace('Z', '+00:00')).timestamp() for c in expected]
+    assert np.array_equal(window['timestamp'], timestamps)
+
+
+def test_push_wraparound():
+    """Pushing past capacity keeps only the newest candles, in order."""
+    buffer = CandleRingBuffer(4)
+    candles = [_candle(i) for i in range(11)]
+    for n, candle in enumerate(candles, 1):
+        buffer.push(candle)
+        assert len(buffer) == min(n, 4)
+        _assert_matches(buffer, candles[:n][-4:])
+    assert buffer.last_timestamp == buffer.window()['timestamp'][-1]
+
+
+def test_replace_last_after_wrap():
+    """replace_last overwrites the newest candle after the head wrapped around."""
+    buffer = CandleRingBuffer(3)
+    candles = [_candle(i) for i in range(7)]
+    for candle in candles:
+        buffer.push(candle)
+
+    updated = _candle(6, close=999.0)
+    buffer.replace_last(updated)
+
+    _assert_matches(buffer, [candles[4], candles[5], updated])
+
+
+def test_replace_last_at_slot_zero():
+    """replace_last works when the newest candle sits in the last slot."""
+    buffer = CandleRingBuffer(3)
+    candles = [_candle(i) for i in range(3)]
+    for candle in candles:
+        buffer.push(candle)
+
+    updated = _candle(2, close=42.0)
+    buffer.replace_last(updated)
+
+    _assert_matches(buffer, [candles[0], candles[1], updated])
+
+
+def test_window_larger_than_size():
+    """Asking for more periods than stored returns every stored candle."""
+    buffer = CandleRingBuffer(10)
+    candles = [_candle(i) for i in range(4)]
+    buffer.extend(candles)
+
+    _assert_matches(buffer, candles, periods=50)
+    _assert_matches(buffer, candles, periods=2)
+    _assert_matches(buffer, candles, periods=0)
+
+
+def test_extend_over_capacity():
+    """Extending with more candles than fit keeps the newest ones."""
+    buffer = CandleRingBuffer(5)
+    candles = [_candle(i) for i in range(12)]
+    buffer.extend(candles)
+
+    assert len(buffer) == 5
+    _assert_matches(buffer, candles[-5:])
+
+
+def test_extend_then_push_wraparound():
+    """Bulk loads and single pushes interleave across the wrap point."""
+    buffer = CandleRingBuffer(5)
+    candles = [_candle(i) for i in range(20)]
+    expected = []
+    for chunk in (candles[0:3], candles[3:4], candles[4:8], candles[8:9], candles[9:20]):
+        if len(chunk) == 1:
+            buffer.push(chunk[0])
+        else:
+            buffer.extend(chunk)
+        expected.extend(chunk)
+        _assert_matches(buffer, expected[-5:])
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_push_wraparound,
+        test_replace_last_after_wrap,
+        test_replace_last_at_slot_zero,
+        test_window_larger_than_size,
+        test_extend_over_capacity,
+        test_extend_then_push_wraparound,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            failed += 1
+
+    print(f"\nPassed: {len(tests) - failed}/{len(tests)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
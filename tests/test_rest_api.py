@@ -3,6 +3,7 @@ Test connection to dYdX v4 testnet using direct REST API calls.
 """
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -77,8 +78,13 @@ if __name__ == "__main__":
 
         # If ETH-USD market exists, get its orderbook and candles
         if "ETH-USD" in markets:
-            logger.info("Testing get_orderbook() for ETH-USD...")
-            orderbook_data = get_orderbook("ETH-USD")
+            # The two probes are independent, so issue them concurrently
+            logger.info("Testing get_orderbook() and get_candles() for ETH-USD...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                orderbook_future = executor.submit(get_orderbook, "ETH-USD")
+                candles_future = executor.submit(get_candles, "ETH-USD", resolution="5MIN", limit=10)
+
+            orderbook_data = orderbook_future.result()
             if orderbook_data:
                 asks = orderbook_data.get("asks", [])
                 bids = orderbook_data.get("bids", [])
@@ -90,8 +96,7 @@ if __name__ == "__main__":
                 if bids:
                     logger.info(f"Top 3 bids: {bids[:3]}")
 
-            logger.info("Testing get_candles() for ETH-USD...")
-            candles_data = get_candles("ETH-USD", resolution="5MIN", limit=10)
+            candles_data = candles_future.result()
             if candles_data:
                 candles = candles_data.get("candles", [])
                 logger.info(f"Retrieved {len(candles)} candles for ETH-USD")